@@ -41,19 +41,20 @@ setup(
     long_description_content_type="text/x-rst",
     packages=find_packages(exclude=["tests*"]),
     include_package_data=True,
-    python_requires=">=3.7",
+    python_requires=">=3.8",
     install_requires=[
         "tutor>=17,<19",
-        "requests",
-        "pydantic",
+        "httpx[http2]>=0.25.0",
     ],
     extras_require={
+        "orjson": ["orjson"],
+        "brotli": ["brotli"],
+        "diskcache": ["diskcache"],
         "dev": [
             "black",
             "mypy",
             "pylint",
             "tutor[dev]>=17,<19",
-            "types-requests",
         ]
     },
     entry_points={
@@ -1,8 +1,16 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
 import click
-from tutor import config
-from tutor.commands.k8s import K8sContext
 
-from .newrelic import NewRelicClient
+# The Tutor and NerdGraph client modules are imported where they are used, so
+# listing the commands or printing their help stays fast.
+if TYPE_CHECKING:
+    from .newrelic import NewRelicClient
+    from .newrelic.client import CacheBackend, Response
 
 
 @click.group(help="Commands for registering NewRelic alerts.")
@@ -12,9 +20,75 @@ def newrelic(context: click.Context) -> None:
     NewRelic command group.
     """
 
+    from tutor.commands.k8s import K8sContext
+
     context.obj = K8sContext(context.obj.root)
 
 
+def _load_config(context: Any) -> Dict[str, Any]:
+    """
+    Load the Tutor config of the project, caching it on the command context.
+
+    The group callback also runs for `--help` of the subcommands, so the
+    config is loaded on first use instead of there.
+    """
+
+    from tutor import config
+
+    if getattr(context, "loaded_config", None) is None:
+        context.loaded_config = config.load(context.root)
+
+    loaded_config: Dict[str, Any] = context.loaded_config
+    return loaded_config
+
+
+@contextmanager
+def _open_cache(root: str) -> Iterator[Optional[CacheBackend]]:
+    """
+    Open the NerdGraph lookup cache of the project, if diskcache is installed.
+
+    The cache is closed when the context exits.
+    """
+
+    try:
+        from diskcache import Cache
+    except ImportError:
+        yield None
+        return
+
+    with Cache(os.path.join(root, "newrelic-cache")) as cache:
+        yield cache
+
+
+def _ensure_monitor_and_condition(
+    client: NewRelicClient,
+    url: str,
+    monitor: Optional[Response],
+    condition: Optional[Response],
+    policy_id: str,
+    period: str,
+    location: str,
+) -> Tuple[Response, Response]:
+    """
+    Create the synthetics monitor and alert condition of a URL if missing.
+    """
+
+    if monitor is None:
+        monitor = client.create_synthetics_monitor(
+            name=url,
+            uri=url,
+            period=period,
+            locations=[location],
+        )
+
+    if condition is None:
+        condition = client.create_alert_condition(
+            monitor_name=monitor.name, uri=url, policy_id=policy_id
+        )
+
+    return monitor, condition
+
+
 @newrelic.command(help="Register NewRelic monitoring resources")
 @click.pass_obj
 def create_alert_workflow(context: click.Context) -> None:
@@ -22,55 +96,78 @@ def create_alert_workflow(context: click.Context) -> None:
     Create the necessary resources on NewRelic for the instance.
     """
 
-    loaded_config = config.load(context.root)  # type: ignore
-    instance_name = str(loaded_config["NEWRELIC_NAME"])
+    from concurrent.futures import ThreadPoolExecutor
 
-    client = NewRelicClient(
-        api_key=str(loaded_config["NEWRELIC_API_KEY"]),
-        account_id=int(loaded_config["NEWRELIC_ACCOUNT_ID"]),  # type: ignore
-        region=str(loaded_config["NEWRELIC_REGION_CODE"]),
-    )
+    from .newrelic import NewRelicClient
+    from .newrelic.client import MAX_CONNECTIONS
 
-    click.echo(f"Setting up NewRelic monitoring for {instance_name}")
+    loaded_config = _load_config(context)
+    instance_name = str(loaded_config["NEWRELIC_NAME"])
+    api_key = str(loaded_config["NEWRELIC_API_KEY"])
+    account_id = int(loaded_config["NEWRELIC_ACCOUNT_ID"])
+    region = str(loaded_config["NEWRELIC_REGION_CODE"])
+    period = str(loaded_config["NEWRELIC_MONITORING_PERIOD"])
+    location = str(loaded_config["NEWRELIC_MONITORING_LOCATION"])
+    monitor_configs = loaded_config["NEWRELIC_SYNTHETICS_MONITORS"]
 
     policy_name = f"{instance_name.title()} - Open edX Instance"
-    if (policy := client.get_alert_policy(name=policy_name)) is None:
-        policy = client.create_alert_policy(name=policy_name)
-
-    for monitor_config in loaded_config["NEWRELIC_SYNTHETICS_MONITORS"]:  # type: ignore
-        dst_name = f"Default notification channel for {instance_name}"
-        if (destination := client.get_notification_destination(dst_name)) is None:
-            destination = client.create_notification_destination(
-                name=f"Default notification channel for {instance_name}",
-                recipient=monitor_config["recipient"],  # type: ignore
+    dst_name = channel_name = f"Default notification channel for {instance_name}"
+
+    with _open_cache(context.root) as cache, NewRelicClient(  # type: ignore
+        api_key=api_key, account_id=account_id, region=region, cache=cache
+    ) as client:
+        click.echo(f"Setting up NewRelic monitoring for {instance_name}")
+
+        # Look up the shared resources with a single request. The client
+        # remembers the results, so the ensure_* calls below only send
+        # requests for resources that have to be created.
+        client.bootstrap_lookups(
+            instance_name=instance_name,
+            policy_name=policy_name,
+            destination_name=dst_name,
+            channel_name=channel_name,
+        )
+
+        policy = client.ensure_alert_policy(name=policy_name)
+
+        # The notification resources are shared by every monitor config, so
+        # they are resolved once, using the first config's recipient.
+        if monitor_configs:
+            destination = client.ensure_notification_destination(
+                name=dst_name,
+                recipient=monitor_configs[0]["recipient"],
             )
-
-        channel_name = f"Default notification channel for {instance_name}"
-        if (channel := client.get_notification_channel(channel_name)) is None:
-            channel = client.create_notificaiton_channel(
-                name=f"Default notification channel for {instance_name}",
+            channel = client.ensure_notification_channel(
+                name=channel_name,
                 destination_id=destination.id,
             )
-
-        if (workflow := client.get_ai_workflow(instance_name)) is None:
-            workflow = client.create_ai_workflow(
+            client.ensure_ai_workflow(
                 instance_name=instance_name,
                 policy_id=policy.id,
                 channel_id=channel.id,
             )
 
-        for url in monitor_config["urls"]:  # type: ignore
-            if (monitor := client.get_synthetics_monitor(name=url)) is None:
-                monitor = client.create_synthetics_monitor(
-                    name=url,
-                    uri=url,
-                    period=loaded_config["NEWRELIC_MONITORING_PERIOD"],  # type: ignore
-                    locations=[loaded_config["NEWRELIC_MONITORING_LOCATION"]],  # type: ignore
-                )
-
-            if client.get_alert_condition(monitor_name=monitor.name) is None:
-                client.create_alert_condition(
-                    monitor_name=monitor.name, uri=url, policy_id=policy.id
+        # Every URL is set up independently once the policy exists, so the
+        # monitors and conditions are created concurrently.
+        urls = list(dict.fromkeys(url for mc in monitor_configs for url in mc["urls"]))
+        monitors = client.get_synthetics_monitors(names=urls)
+        conditions = client.get_alert_conditions(monitor_names=urls)
+        policy_id = policy.id
+
+        with ThreadPoolExecutor(max_workers=MAX_CONNECTIONS) as executor:
+            list(
+                executor.map(
+                    lambda url: _ensure_monitor_and_condition(
+                        client,
+                        url,
+                        monitors.get(url),
+                        conditions.get(url),
+                        policy_id,
+                        period,
+                        location,
+                    ),
+                    urls,
                 )
+            )
 
     click.echo(f"NewRelic monitoring is set up for {instance_name}")
@@ -1,9 +1,57 @@
+import hashlib
 import json
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
-
-import requests
-from pydantic import BaseModel
+from functools import lru_cache
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Type, Union
+
+import httpx
+
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json  # type: ignore[no-redef, unused-ignore]
+
+# Maximum number of pooled connections to NerdGraph. Callers issuing requests
+# from multiple threads should not use more workers than this.
+MAX_CONNECTIONS = 16
+
+# Client-side ceiling on the NerdGraph request rate, kept well below the API
+# limits so concurrent workers do not get throttled.
+REQUESTS_PER_MINUTE = 600
+REQUEST_BURST = 25
+
+# Throttled and transiently failing requests are retried with a jittered
+# exponential backoff, unless the response tells how long to wait. A mutation
+# may have been applied even if its response is a gateway error or never
+# arrives, so mutations are only retried when they were throttled.
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+MUTATION_RETRY_STATUSES = frozenset([429])
+RETRY_ERRORS = (httpx.TimeoutException, httpx.RemoteProtocolError)
+MAX_RETRIES = 5
+RETRY_BACKOFF_FACTOR = 0.5
+MAX_RETRY_DELAY = 30.0
+
+# Lookup responses are served from the cache for CACHE_TTL seconds. Every
+# mutation stores its time under _CACHE_INVALIDATED_AT, and entries requested
+# before that are ignored, as the mutation may have changed their answer.
+CACHE_TTL = 30
+_CACHE_INVALIDATED_AT = "invalidated-at"
+
+# Default GraphQL variables. It is only ever serialized, never mutated.
+_EMPTY: Dict[Any, Any] = {}
+
+# Nagle's algorithm is disabled so small request bodies are sent right away,
+# and TCP keep-alive probes keep the pooled connection from going stale.
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
 
 
 class NerdGraphAPIError(BaseException):
@@ -12,23 +60,411 @@ class NerdGraphAPIError(BaseException):
     """
 
 
-class Response(BaseModel):
+class CacheBackend(Protocol):
+    """
+    Key-value store used to cache NerdGraph lookup responses.
+
+    The interface matches `diskcache.Cache`, which is the default backend.
+    """
+
+    def get(self, key: str, default: Any = None) -> Any: ...
+
+    def set(self, key: str, value: Any, expire: Optional[float] = None) -> Any: ...
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of outgoing requests.
+
+    The bucket holds at most `capacity` tokens and is refilled with `rate`
+    tokens per second. Every request takes one token, waiting for a refill
+    when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.__rate = rate
+        self.__capacity = capacity
+        self.__tokens = float(capacity)
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Take a token from the bucket, blocking until one is available.
+        """
+
+        with self.__lock:
+            now = time.monotonic()
+            elapsed = now - self.__updated_at
+            refill = elapsed * self.__rate
+            self.__tokens = min(self.__capacity, self.__tokens + refill)
+            self.__updated_at = now
+
+            self.__tokens -= 1
+            wait = -self.__tokens / self.__rate if self.__tokens < 0 else 0.0
+
+        # The token is already reserved, so sleep outside of the lock to let
+        # other threads queue up behind this one.
+        if wait:
+            time.sleep(wait)
+
+
+@dataclass(frozen=True)
+class Response:
     """
     Base response type for NewRelic NerdGraph responses.
     """
 
+    # dataclass(slots=True) needs Python 3.10, so slots are declared by hand.
+    __slots__ = ("id", "name")
+
     id: str
     name: str
 
 
+@dataclass(frozen=True)
 class SyntheticsMonitorResponse(Response):
     """
     Response type of a NewRelic synthetics monitor.
     """
 
+    __slots__ = ("uri",)
+
     uri: str
 
 
+_Q_BOOTSTRAP_LOOKUPS = """
+query(
+  $accountId: Int!,
+  $policyName: String!,
+  $destinationName: String!,
+  $channelName: String!,
+  $workflowName: String!
+) {
+  actor {
+    account(id: $accountId) {
+      alerts {
+        policiesSearch(searchCriteria: { nameLike: $policyName }) {
+          policies {
+            id
+            name
+          }
+        }
+      }
+      aiNotifications {
+        destinations(filters: { name: $destinationName }) {
+          entities {
+            id
+            name
+          }
+        }
+        channels(filters: { name: $channelName }) {
+          entities {
+            id
+            name
+          }
+        }
+      }
+      aiWorkflows {
+        workflows(filters: { name: $workflowName }) {
+          entities {
+            id
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_GET_ALERT_POLICY = """
+query($accountId: Int!, $name: String!) {
+  actor {
+    account(id: $accountId) {
+      alerts {
+        policiesSearch(searchCriteria: { nameLike: $name }) {
+          policies {
+            id
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_CREATE_ALERT_POLICY = """
+mutation($accountId: Int!, $name: String!) {
+    alertsPolicyCreate(
+        accountId: $accountId
+        policy: { name: $name, incidentPreference: PER_CONDITION }
+    ) {
+        id
+        name
+    }
+}
+"""
+
+_Q_GET_SYNTHETICS_MONITORS = """
+query ($query: String!, $cursor: String) {
+  actor {
+    entitySearch(query: $query) {
+      results(cursor: $cursor) {
+        nextCursor
+        entities {
+          guid
+          name
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_CREATE_SYNTHETICS_MONITOR = """
+mutation($accountId: Int!, $monitor: SyntheticsCreateSimpleMonitorInput!) {
+  syntheticsCreateSimpleMonitor(accountId: $accountId, monitor: $monitor) {
+    monitor {
+      id
+      name
+    }
+  }
+}
+"""
+
+_Q_CREATE_ALERT_CONDITION = """
+mutation($accountId: Int!, $policyId: ID!, $condition: AlertsNrqlConditionStaticInput!) {
+    alertsNrqlConditionStaticCreate(
+        accountId: $accountId,
+        policyId: $policyId,
+        condition: $condition,
+    ) {
+        id
+        name
+    }
+}
+"""
+
+_Q_GET_NOTIFICATION_DESTINATION = """
+query($accountId: Int!, $name: String!) {
+  actor {
+    account(id: $accountId) {
+      aiNotifications {
+        destinations(filters: { name: $name }) {
+          entities {
+            id
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_CREATE_NOTIFICATION_DESTINATION = """
+mutation($accountId: Int!, $name: String!, $recipient: String!) {
+  aiNotificationsCreateDestination(
+    accountId: $accountId,
+    destination: {
+      name: $name,
+      type: EMAIL,
+      properties: {
+        key: "email",
+        value: $recipient
+      }
+    }
+  ) {
+    destination {
+      id
+      name
+    }
+    error {
+      __typename
+    }
+  }
+}
+"""
+
+_Q_GET_NOTIFICATION_CHANNEL = """
+query($accountId: Int!, $name: String!) {
+  actor {
+    account(id: $accountId) {
+      aiNotifications {
+        channels(filters: { name: $name }) {
+          entities {
+            id
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_CREATE_NOTIFICATION_CHANNEL = """
+mutation($accountId: Int!, $name: String!, $destinationId: ID!) {
+  aiNotificationsCreateChannel(
+    accountId: $accountId,
+    channel: {
+      type: EMAIL
+      name: $name
+      destinationId: $destinationId
+      product: IINT
+      properties: []
+    }
+  ) {
+    channel {
+      id
+      name
+    }
+    error {
+      __typename
+    }
+  }
+}
+"""
+
+_Q_GET_AI_WORKFLOW = """
+query($accountId: Int!, $name: String!) {
+  actor {
+    account(id: $accountId) {
+      aiWorkflows {
+        workflows(filters: { name: $name }) {
+          entities {
+            id
+            name
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_Q_CREATE_AI_WORKFLOW = """
+mutation($accountId: Int!, $name: String!, $filterName: String!, $policyIds:[String!]!, $channelId: ID!) {
+  aiWorkflowsCreateWorkflow(
+    accountId: $accountId,
+    createWorkflowData: {
+      name: $name,
+      workflowEnabled: true,
+      destinationsEnabled: true,
+      mutingRulesHandling: NOTIFY_ALL_ISSUES,
+      issuesFilter: {
+        name: $filterName,
+        type: FILTER,
+        predicates: [
+          {
+            attribute: "labels.policyIds",
+            operator: EXACTLY_MATCHES,
+            values: $policyIds,
+          }
+        ]
+      }
+      destinationConfigurations: {
+        channelId: $channelId,
+        notificationTriggers: [ACTIVATED, CLOSED],
+      }
+    }
+  ) {
+    workflow {
+      id
+      name
+    }
+    errors {
+      description
+      type
+    }
+  }
+}
+"""
+
+
+@lru_cache(maxsize=None)
+def _alert_conditions_query(count: int) -> str:
+    """
+    Build the query document looking up `count` alert conditions by name.
+
+    Each lookup is aliased as `c<index>` and takes a variable of the same name.
+    """
+
+    arguments = ", ".join(f"$c{index}: String!" for index in range(count))
+    fields = " ".join(
+        f"c{index}: nrqlConditionsSearch(searchCriteria: {{ name: $c{index} }}) "
+        "{ nrqlConditions { id name } }"
+        for index in range(count)
+    )
+
+    return f"""
+query($accountId: Int!, {arguments}) {{
+  actor {{
+    account(id: $accountId) {{
+      alerts {{
+        {fields}
+      }}
+    }}
+  }}
+}}
+"""
+
+
+def _quote(value: str) -> str:
+    """
+    Quote a string literal for use in an entity search query.
+    """
+
+    escaped = value.replace("\\", "\\\\").replace("'", "\\'")
+    return f"'{escaped}'"
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    """
+    Return how many seconds to wait before retrying a failed request.
+
+    The delay is jittered, so concurrent workers failing together do not
+    retry in lockstep, and never exceeds MAX_RETRY_DELAY.
+    """
+
+    jitter = random.uniform(0, RETRY_BACKOFF_FACTOR)
+
+    retry_after = response.headers.get("Retry-After", "") if response else ""
+    if retry_after.isdigit():
+        return min(float(retry_after) + jitter, MAX_RETRY_DELAY)
+
+    backoff = RETRY_BACKOFF_FACTOR * 2.0**attempt
+    return min(backoff + random.uniform(0, backoff), MAX_RETRY_DELAY)
+
+
+def _cache_key(api_key: str, query: str, variables: Dict[Any, Any]) -> str:
+    """
+    Return the cache key of a NerdGraph request.
+
+    The API key is part of the key, so responses are never shared between
+    accounts using the same cache.
+    """
+
+    payload = json.dumps([api_key, query, variables], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _find_by_name(
+    entities: List[Dict[str, Any]], name: str, id_field: str = "id"
+) -> Optional[Response]:
+    """
+    Return the entity with the exact given name from a NerdGraph result list.
+    """
+
+    for entity in entities:
+        if entity["name"] == name:
+            return Response(id=entity[id_field], name=entity["name"])
+
+    return None
+
+
 class NewRelicClient:
     """
     NewRelic NerdGraph API client for managing resources.
@@ -37,77 +473,286 @@ class NewRelicClient:
     destinations and more for an Open edX instance.
     """
 
-    def __init__(self, api_key: str, account_id: int, region: str) -> None:
+    __slots__ = (
+        "__account_id",
+        "__api_base_url",
+        "__api_key",
+        "__rate_limiter",
+        "__lookup_cache",
+        "__client",
+        "__cache",
+        "__invalidated_at",
+    )
+
+    def __init__(
+        self,
+        api_key: str,
+        account_id: int,
+        region: str,
+        cache: Optional[CacheBackend] = None,
+    ) -> None:
         self.__account_id = account_id
 
         api_region = ".eu" if region.lower() == "eu" else ""
         self.__api_base_url = f"https://api{api_region}.newrelic.com/graphql"
         self.__api_key = api_key
 
+        self.__cache = cache
+        self.__invalidated_at = (
+            float(cache.get(_CACHE_INVALIDATED_AT, 0.0)) if cache is not None else 0.0
+        )
+        self.__rate_limiter = _TokenBucket(REQUESTS_PER_MINUTE / 60, REQUEST_BURST)
+
+        # Named resources looked up or created by this client, keyed by
+        # (kind, name), so repeated lookups do not hit the API again.
+        self.__lookup_cache: Dict[Tuple[str, str], Optional[Response]] = {}
+
+        # All requests go to the same NerdGraph host. Over HTTP/2 they are
+        # multiplexed as concurrent streams on one connection, so threads
+        # sharing the client do not wait for each other's round-trips.
+        self.__client = httpx.Client(
+            headers={
+                "API-Key": self.__api_key,
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            transport=httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(
+                    max_keepalive_connections=4,
+                    max_connections=MAX_CONNECTIONS,
+                ),
+                socket_options=_SOCKET_OPTIONS,
+            ),
+        )
+
+    def __enter__(self) -> "NewRelicClient":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the underlying HTTP client and its pooled connections.
+        """
+
+        self.__client.close()
+
     def __send_request(
-        self, query: str, variables: Optional[Dict[Any, Any]] = None
+        self,
+        query: str,
+        variables: Dict[Any, Any] = _EMPTY,
+        cacheable: bool = False,
     ) -> Dict[Any, Any]:
         """
         Send a GraphQL request to the API endpoint.
 
         If the request fails or returns a non-200 request, an exception is raised.
+
+        Cacheable lookups are read-only, so they are retried on server errors,
+        timeouts and broken connections. Other requests are only retried when
+        NerdGraph throttles them.
+
+        Responses of cacheable lookups are served from the cache while fresh.
+        Any other request may have changed the resources, even one that
+        failed, so it invalidates every response requested before it, both
+        before it is sent and once it succeeds.
         """
 
-        if variables is None:
-            variables = dict()
+        cache_key = None
+
+        if cacheable and self.__cache is not None:
+            cache_key = _cache_key(self.__api_key, query, variables)
+            cached = self.__cache.get(cache_key)
 
-        response = requests.post(
-            self.__api_base_url,
-            headers={"API-Key": self.__api_key},
-            json={
+            if (
+                cached is not None
+                and cached[0] > self.__invalidated_at
+                and time.time() - cached[0] < CACHE_TTL
+            ):
+                return cached[1]  # type: ignore
+
+        content = _json.dumps(
+            {
                 "query": query,
                 "variables": variables,
-            },
+            }
         )
 
+        if not cacheable:
+            self.__invalidate_cache()
+
+        requested_at = time.time()
+        retry_statuses = RETRY_STATUSES if cacheable else MUTATION_RETRY_STATUSES
+
+        for attempt in range(MAX_RETRIES + 1):
+            can_retry = attempt < MAX_RETRIES
+            self.__rate_limiter.acquire()
+
+            try:
+                response = self.__client.post(self.__api_base_url, content=content)
+            except httpx.TransportError as exc:
+                if cacheable and can_retry and isinstance(exc, RETRY_ERRORS):
+                    time.sleep(_retry_delay(None, attempt))
+                    continue
+
+                raise NerdGraphAPIError(f"NerdGraph request failed: {exc!r}") from exc
+
+            if response.status_code not in retry_statuses or not can_retry:
+                break
+
+            time.sleep(_retry_delay(response, attempt))
+
         if response.status_code != 200:
             raise NerdGraphAPIError(response.text)
 
-        response = json.loads(response.content)
+        response = _json.loads(response.content)
 
-        if response.get("errors"):  # type: ignore
+        if response.get("errors"):
             raise NerdGraphAPIError(response)
 
+        if self.__cache is not None:
+            if cache_key is not None:
+                self.__cache.set(
+                    cache_key,
+                    (requested_at, response["data"]),
+                    expire=CACHE_TTL,
+                )
+            else:
+                self.__invalidate_cache()
+
         return response["data"]  # type: ignore
 
-    def get_alert_policy(self, name: str) -> Optional[Response]:
+    def __invalidate_cache(self) -> None:
         """
-        Get policy by its name.
+        Invalidate every cached lookup requested until now.
         """
 
-        query = """
-        query($accountId: Int!, $name: String!) {
-          actor {
-            account(id: $accountId) {
-              alerts {
-                policiesSearch(searchCriteria: { nameLike: $name }) {
-                  policies {
-                    id
-                    name
-                  }
-                }
-              }
-            }
-          }
+        if self.__cache is not None:
+            self.__invalidated_at = time.time()
+            self.__cache.set(_CACHE_INVALIDATED_AT, self.__invalidated_at)
+
+    def __remember(
+        self, kind: str, name: str, resource: Optional[Response]
+    ) -> Optional[Response]:
+        """
+        Store the result of a named lookup in the lookup cache and return it.
+        """
+
+        self.__lookup_cache[(kind, name)] = resource
+        return resource
+
+    def bootstrap_lookups(
+        self,
+        instance_name: str,
+        policy_name: str,
+        destination_name: str,
+        channel_name: str,
+    ) -> Tuple[
+        Optional[Response], Optional[Response], Optional[Response], Optional[Response]
+    ]:
+        """
+        Get the alert policy, notification destination, notification channel
+        and applied intelligence workflow of an instance in one request.
+
+        The returned tuple is in the order listed above, with `None` for every
+        resource that does not exist yet.
+        """
+
+        workflow_name = f"Alert intelligence workflow of {instance_name} instance"
+
+        variables = {
+            "accountId": self.__account_id,
+            "policyName": policy_name,
+            "destinationName": destination_name,
+            "channelName": channel_name,
+            "workflowName": workflow_name,
         }
+
+        response = self.__send_request(_Q_BOOTSTRAP_LOOKUPS, variables, cacheable=True)
+        account = response["actor"]["account"]
+        notifications = account["aiNotifications"]
+
+        return (
+            self.__remember(
+                "policy",
+                policy_name,
+                _find_by_name(
+                    account["alerts"]["policiesSearch"]["policies"], policy_name
+                ),
+            ),
+            self.__remember(
+                "destination",
+                destination_name,
+                _find_by_name(
+                    notifications["destinations"]["entities"], destination_name
+                ),
+            ),
+            self.__remember(
+                "channel",
+                channel_name,
+                _find_by_name(notifications["channels"]["entities"], channel_name),
+            ),
+            self.__remember(
+                "workflow",
+                workflow_name,
+                _find_by_name(
+                    account["aiWorkflows"]["workflows"]["entities"], workflow_name
+                ),
+            ),
+        )
+
+    def get_alert_conditions(self, monitor_names: List[str]) -> Dict[str, Response]:
+        """
+        Get the alert conditions of the given monitors in one request.
+
+        The result maps each monitor name to its alert condition. Monitors
+        without an alert condition are left out.
+        """
+
+        if not monitor_names:
+            return {}
+
+        variables: Dict[str, Any] = {"accountId": self.__account_id}
+        for index, monitor_name in enumerate(monitor_names):
+            variables[f"c{index}"] = f"Lost signal for {monitor_name}"
+
+        query = _alert_conditions_query(len(monitor_names))
+        response = self.__send_request(query, variables, cacheable=True)
+        alerts = response["actor"]["account"]["alerts"]
+
+        conditions = {}
+        for index, monitor_name in enumerate(monitor_names):
+            condition = _find_by_name(
+                alerts[f"c{index}"]["nrqlConditions"], variables[f"c{index}"]
+            )
+            if condition is not None:
+                conditions[monitor_name] = condition
+
+        return conditions
+
+    def get_alert_policy(self, name: str) -> Optional[Response]:
         """
+        Get policy by its name.
+        """
+
+        if ("policy", name) in self.__lookup_cache:
+            return self.__lookup_cache[("policy", name)]
 
         variables = {"accountId": self.__account_id, "name": name}
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_GET_ALERT_POLICY, variables, cacheable=True)
         alerts = response["actor"]["account"]["alerts"]
         policies = alerts["policiesSearch"]["policies"]
 
-        for policy in policies:
-            if policy["name"] == name:
-                return Response(id=policy["id"], name=policy["name"])
-
-        return None
+        return self.__remember("policy", name, _find_by_name(policies, name))
 
     def create_alert_policy(self, name: str) -> Response:
         """
@@ -116,58 +761,54 @@ class NewRelicClient:
         If the alert policy exists by name, the policy will not be created.
         """
 
-        query = """
-        mutation($accountId: Int!, $name: String!) {
-            alertsPolicyCreate(
-                accountId: $accountId
-                policy: { name: $name, incidentPreference: PER_CONDITION }
-            ) {
-                id
-                name
-            }
-        }"""
-
         variables = {
             "accountId": self.__account_id,
             "name": name,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_ALERT_POLICY, variables)
         response = response["alertsPolicyCreate"]
+        policy = Response(id=response["id"], name=response["name"])
+        self.__remember("policy", name, policy)
 
-        return Response(id=response["id"], name=response["name"])
+        return policy
 
-    def get_synthetics_monitor(self, name: str) -> Optional[Response]:
+    def get_synthetics_monitors(self, names: List[str]) -> Dict[str, Response]:
         """
-        Get synthetics monitor by its name.
+        Get synthetics monitors by their names.
+
+        All monitors are looked up with a single entity search, following the
+        result pages if needed. The result maps each found name to its monitor.
         """
 
-        query = """
-        query ($query: String!) {
-          actor {
-            entitySearch(query: $query) {
-              results {
-                entities {
-                  guid
-                  name
-                }
-              }
-            }
-          }
-        }"""
+        if not names:
+            return {}
 
-        variables = {
-            "query": f"domain = 'SYNTH' AND type = 'MONITOR' AND name = '{name}'"
+        expected = set(names)
+        monitors: Dict[str, Response] = {}
+        variables: Dict[str, Any] = {
+            "query": "domain = 'SYNTH' AND type = 'MONITOR' AND name IN ({})".format(
+                ", ".join(_quote(name) for name in sorted(expected))
+            ),
+            "cursor": None,
         }
 
-        response = self.__send_request(query, variables)
-        entities = response["actor"]["entitySearch"]["results"]["entities"]
+        while True:
+            response = self.__send_request(
+                _Q_GET_SYNTHETICS_MONITORS, variables, cacheable=True
+            )
+            results = response["actor"]["entitySearch"]["results"]
+
+            for entity in results["entities"]:
+                if entity["name"] in expected:
+                    monitors[entity["name"]] = Response(
+                        id=entity["guid"], name=entity["name"]
+                    )
 
-        for entity in entities:
-            if entity["name"] == name:
-                return Response(id=entity["guid"], name=entity["name"])
+            if not results["nextCursor"]:
+                return monitors
 
-        return None
+            variables["cursor"] = results["nextCursor"]
 
     def create_synthetics_monitor(
         self, name: str, uri: str, period: str, locations: List[str]
@@ -176,16 +817,6 @@ class NewRelicClient:
         Create synthetics monitor for the given URI.
         """
 
-        query = """
-        mutation($accountId: Int!, $monitor: SyntheticsCreateSimpleMonitorInput!) {
-          syntheticsCreateSimpleMonitor(accountId: $accountId, monitor: $monitor) {
-            monitor {
-              id
-              name
-            }
-          }
-        }"""
-
         variables = {
             "accountId": self.__account_id,
             "monitor": {
@@ -197,7 +828,7 @@ class NewRelicClient:
             },
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_SYNTHETICS_MONITOR, variables)
         response = response["syntheticsCreateSimpleMonitor"]
 
         return SyntheticsMonitorResponse(
@@ -209,38 +840,7 @@ class NewRelicClient:
         Get alert condition by its name.
         """
 
-        condition_name = f"Lost signal for {monitor_name}"
-
-        query = """
-        query($accountId: Int!, $name: String!) {
-          actor {
-            account(id: $accountId) {
-              alerts {
-                nrqlConditionsSearch(searchCriteria: { name: $name }) {
-                  nrqlConditions {
-                    id
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }"""
-
-        variables = {
-            "accountId": self.__account_id,
-            "name": condition_name,
-        }
-
-        response = self.__send_request(query, variables)
-        alerts = response["actor"]["account"]["alerts"]
-        conditions = alerts["nrqlConditionsSearch"]["nrqlConditions"]
-
-        for condition in conditions:
-            if condition["name"] == condition_name:
-                return Response(id=condition["id"], name=condition["name"])
-
-        return None
+        return self.get_alert_conditions([monitor_name]).get(monitor_name)
 
     def create_alert_condition(
         self, monitor_name: str, uri: str, policy_id: str
@@ -249,18 +849,6 @@ class NewRelicClient:
         Create static NRQL alert condition for the given policy and monitor.
         """
 
-        query = """
-        mutation($accountId: Int!, $policyId: ID!, $condition: AlertsNrqlConditionStaticInput!) {
-            alertsNrqlConditionStaticCreate(
-                accountId: $accountId,
-                policyId: $policyId,
-                condition: $condition,
-            ) {
-                id
-                name
-            }
-        }"""
-
         variables = {
             "accountId": self.__account_id,
             "policyId": policy_id,
@@ -303,7 +891,7 @@ class NewRelicClient:
             },
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_ALERT_CONDITION, variables)
         response = response["alertsNrqlConditionStaticCreate"]
 
         return Response(id=response["id"], name=response["name"])
@@ -313,160 +901,92 @@ class NewRelicClient:
         Get notification destination by its name.
         """
 
-        query = """
-        query($accountId: Int!, $name: String!) {
-          actor {
-            account(id: $accountId) {
-              aiNotifications {
-                destinations(filters: { name: $name }) {
-                  entities {
-                    id
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }"""
+        if ("destination", name) in self.__lookup_cache:
+            return self.__lookup_cache[("destination", name)]
 
         variables = {
             "accountId": self.__account_id,
             "name": name,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(
+            _Q_GET_NOTIFICATION_DESTINATION, variables, cacheable=True
+        )
         destinations = response["actor"]["account"]["aiNotifications"]["destinations"]
         entities = destinations["entities"]
 
-        for entity in entities:
-            if entity["name"] == name:
-                return Response(id=entity["id"], name=entity["name"])
-
-        return None
+        return self.__remember("destination", name, _find_by_name(entities, name))
 
     def create_notification_destination(self, name: str, recipient: str) -> Response:
         """
         Create a notification channel to notifiy if the instance is down.
         """
 
-        query = """
-        mutation($accountId: Int!, $name: String!, $recipient: String!) {
-          aiNotificationsCreateDestination(
-            accountId: $accountId,
-            destination: {
-              name: $name,
-              type: EMAIL,
-              properties: {
-                key: "email",
-                value: $recipient
-              }
-            }
-          ) {
-            destination {
-              id
-              name
-            }
-            error {
-              __typename
-            }
-          }
-        }"""
-
         variables = {
             "accountId": self.__account_id,
             "name": name,
             "recipient": recipient,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_NOTIFICATION_DESTINATION, variables)
 
         if response.get("error"):
             raise NerdGraphAPIError(f"Unexpected NerdGraph error: {response}")
 
         response = response["aiNotificationsCreateDestination"]
-
-        return Response(
+        destination = Response(
             id=response["destination"]["id"],
             name=response["destination"]["name"],
         )
+        self.__remember("destination", name, destination)
+
+        return destination
 
     def get_notification_channel(self, name: str) -> Optional[Response]:
         """
         Get notification channel by its name.
         """
 
-        query = """
-        query($accountId: Int!, $name: String!) {
-          actor {
-            account(id: $accountId) {
-              aiNotifications {
-                channels(filters: { name: $name }) {
-                  entities {
-                    id
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }"""
+        if ("channel", name) in self.__lookup_cache:
+            return self.__lookup_cache[("channel", name)]
 
         variables = {
             "accountId": self.__account_id,
             "name": name,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(
+            _Q_GET_NOTIFICATION_CHANNEL, variables, cacheable=True
+        )
         channels = response["actor"]["account"]["aiNotifications"]["channels"]
         entities = channels["entities"]
 
-        for entity in entities:
-            if entity["name"] == name:
-                return Response(id=entity["id"], name=entity["name"])
+        return self.__remember("channel", name, _find_by_name(entities, name))
 
-        return None
-
-    def create_notificaiton_channel(self, name: str, destination_id: str) -> Response:
+    def create_notification_channel(self, name: str, destination_id: str) -> Response:
         """
         Create notification channel for the instance alerts.
         """
 
-        query = """
-        mutation($accountId: Int!, $name: String!, $destinationId: ID!) {
-          aiNotificationsCreateChannel(
-            accountId: $accountId,
-            channel: {
-              type: EMAIL
-              name: $name
-              destinationId: $destinationId
-              product: IINT
-              properties: []
-            }
-          ) {
-            channel {
-              id
-              name
-            }
-            error {
-              __typename
-            }
-          }
-        }"""
-
         variables = {
             "accountId": self.__account_id,
             "name": name,
             "destinationId": destination_id,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_NOTIFICATION_CHANNEL, variables)
 
         if response.get("error"):
             raise NerdGraphAPIError(f"Unexpected NerdGraph error: {response}")
 
         response = response["aiNotificationsCreateChannel"]
+        channel = Response(
+            id=response["channel"]["id"],
+            name=response["channel"]["name"],
+        )
+        self.__remember("channel", name, channel)
 
-        return Response(id=response["channel"]["id"], name=response["channel"]["name"])
+        return channel
 
     def get_ai_workflow(self, instance_name: str) -> Optional[Response]:
         """
@@ -475,36 +995,21 @@ class NewRelicClient:
 
         workflow_name = f"Alert intelligence workflow of {instance_name} instance"
 
-        query = """
-        query($accountId: Int!, $name: String!) {
-          actor {
-            account(id: $accountId) {
-              aiWorkflows {
-                workflows(filters: { name: $name }) {
-                  entities {
-                    id
-                    name
-                  }
-                }
-              }
-            }
-          }
-        }"""
+        if ("workflow", workflow_name) in self.__lookup_cache:
+            return self.__lookup_cache[("workflow", workflow_name)]
 
         variables = {
             "accountId": self.__account_id,
             "name": workflow_name,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_GET_AI_WORKFLOW, variables, cacheable=True)
         workflows = response["actor"]["account"]["aiWorkflows"]["workflows"]
         entities = workflows["entities"]
 
-        for entity in entities:
-            if entity["name"] == workflow_name:
-                return Response(id=entity["id"], name=entity["name"])
-
-        return None
+        return self.__remember(
+            "workflow", workflow_name, _find_by_name(entities, workflow_name)
+        )
 
     def create_ai_workflow(
         self, instance_name: str, policy_id: str, channel_id: str
@@ -513,44 +1018,6 @@ class NewRelicClient:
         Create an applied intelligence workflow and alert destination.
         """
 
-        query = """
-        mutation($accountId: Int!, $name: String!, $filterName: String!, $policyIds:[String!]!, $channelId: ID!) {
-          aiWorkflowsCreateWorkflow(
-            accountId: $accountId,
-            createWorkflowData: {
-              name: $name,
-              workflowEnabled: true,
-              destinationsEnabled: true,
-              mutingRulesHandling: NOTIFY_ALL_ISSUES,
-              issuesFilter: {
-                name: $filterName,
-                type: FILTER,
-                predicates: [
-                  {
-                    attribute: "labels.policyIds",
-                    operator: EXACTLY_MATCHES,
-                    values: $policyIds,
-                  }
-                ]
-              }
-              destinationConfigurations: {
-                channelId: $channelId,
-                notificationTriggers: [ACTIVATED, CLOSED],
-              }
-            }
-          ) {
-            workflow {
-              id
-              name
-            }
-            errors {
-              description
-              type
-            }
-          }
-        }
-        """
-
         variables = {
             "accountId": self.__account_id,
             "name": f"Alert intelligence workflow of {instance_name} instance",
@@ -559,7 +1026,7 @@ class NewRelicClient:
             "channelId": channel_id,
         }
 
-        response = self.__send_request(query, variables)
+        response = self.__send_request(_Q_CREATE_AI_WORKFLOW, variables)
 
         if response.get("error"):
             raise NerdGraphAPIError(f"Unexpected NerdGraph error: {response}")
@@ -567,9 +1034,55 @@ class NewRelicClient:
         response = response["aiWorkflowsCreateWorkflow"]
 
         if response["workflow"] is None:
-            raise NerdGraphAPIError("A workflow with the given name already exists")
+            raise NerdGraphAPIError(f"Unexpected NerdGraph error: {response['errors']}")
 
-        return Response(
+        workflow = Response(
             id=response["workflow"]["id"],
             name=response["workflow"]["name"],
         )
+        self.__remember("workflow", workflow.name, workflow)
+
+        return workflow
+
+    def ensure_alert_policy(self, name: str) -> Response:
+        """
+        Get the alert policy by its name, creating it if it does not exist.
+        """
+
+        if (policy := self.get_alert_policy(name)) is None:
+            policy = self.create_alert_policy(name)
+
+        return policy
+
+    def ensure_notification_destination(self, name: str, recipient: str) -> Response:
+        """
+        Get the notification destination by its name, creating it if needed.
+        """
+
+        if (destination := self.get_notification_destination(name)) is None:
+            destination = self.create_notification_destination(name, recipient)
+
+        return destination
+
+    def ensure_notification_channel(self, name: str, destination_id: str) -> Response:
+        """
+        Get the notification channel by its name, creating it if needed.
+        """
+
+        if (channel := self.get_notification_channel(name)) is None:
+            channel = self.create_notification_channel(name, destination_id)
+
+        return channel
+
+    def ensure_ai_workflow(
+        self, instance_name: str, policy_id: str, channel_id: str
+    ) -> Response:
+        """
+        Get the applied intelligence workflow of the instance, creating it if
+        needed.
+        """
+
+        if (workflow := self.get_ai_workflow(instance_name)) is None:
+            workflow = self.create_ai_workflow(instance_name, policy_id, channel_id)
+
+        return workflow